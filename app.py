@@ -3,23 +3,35 @@ Unified AI Model Service API
 Provides endpoints for text generation (via Ollama) and image analysis (via Hugging Face).
 """
 
+import asyncio
 import io
 import logging
+import math
+import shutil
+import tempfile
 import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
 from pathlib import Path
-from typing import Optional
+from typing import BinaryIO, Optional
 
 import httpx
+import orjson
 import torch
-from fastapi import FastAPI, File, HTTPException, UploadFile, Request
-from fastapi.responses import HTMLResponse
+import xxhash
+from cachetools import TTLCache
+from fastapi import FastAPI, File, Header, HTTPException, UploadFile, Request
+from fastapi.responses import HTMLResponse, ORJSONResponse, Response, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 from PIL import Image
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
 from pydantic import BaseModel, Field
+from starlette.background import BackgroundTask
 from transformers import pipeline
 
-import config
+from config import settings
+from metrics import CACHE_HITS, CACHE_MISSES, CACHE_SIZE, REQUEST_LATENCY
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -28,11 +40,52 @@ logger = logging.getLogger(__name__)
 # Server boot ID for cache invalidation (using nanosecond precision)
 SERVER_BOOT_ID = str(time.time_ns())
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Create shared resources at startup and release them at shutdown."""
+    # Size the default executor that asyncio.to_thread uses for image decode/inference
+    asyncio.get_running_loop().set_default_executor(
+        ThreadPoolExecutor(max_workers=settings.thread_pool_size, thread_name_prefix="modelhub")
+    )
+    # Persistent connection pool for Ollama so requests reuse keep-alive sockets
+    app.state.http = httpx.AsyncClient(
+        base_url=settings.ollama_base_url,
+        timeout=settings.ollama_timeout,
+        limits=httpx.Limits(
+            max_connections=settings.http_max_connections,
+            max_keepalive_connections=settings.http_max_keepalive_connections,
+        ),
+        http2=True,
+    )
+    # Dynamic micro-batcher for image classification requests
+    app.state.image_queue = asyncio.Queue()
+    app.state.image_batcher = asyncio.create_task(run_image_batcher(app.state.image_queue))
+    if not settings.lazy_load_image_model:
+        try:
+            await asyncio.get_running_loop().run_in_executor(
+                inference_executor, warm_up_image_classifier
+            )
+        except Exception as e:
+            logger.error("Image model warm-up failed, falling back to lazy loading: %s", e)
+    try:
+        yield
+    finally:
+        app.state.image_batcher.cancel()
+        try:
+            await app.state.image_batcher
+        except asyncio.CancelledError:
+            pass
+        await app.state.http.aclose()
+
+
 # Initialize FastAPI app
 app = FastAPI(
     title="Unified AI Model Service",
     description="REST API for text generation and image analysis",
     version="1.0.0",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan,
 )
 
 # Setup static files and templates
@@ -41,6 +94,55 @@ app.mount("/static", StaticFiles(directory=BASE_DIR / "static"), name="static")
 templates = Jinja2Templates(directory=BASE_DIR / "templates")
 
 
+# Request latency middleware
+class RequestLatencyMiddleware:
+    """
+    Observe request latency per route template.
+
+    Implemented as plain ASGI so the timer stops when the last body chunk is
+    sent, which covers streaming responses. Requests served by a mount (such as
+    /static) have no route and are labelled with the mount path instead.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        root_path = scope.get("root_path", "")
+        observed = False
+
+        def observe():
+            nonlocal observed
+            if observed:
+                return
+            observed = True
+            route = scope.get("route")
+            if route is not None:
+                endpoint = route.path
+            else:
+                # Mounts extend root_path with the matched prefix instead of setting a route
+                endpoint = scope.get("root_path", "")[len(root_path):] or "unmatched"
+            REQUEST_LATENCY.labels(endpoint).observe(time.perf_counter() - start)
+
+        async def send_and_observe(message):
+            await send(message)
+            if message["type"] == "http.response.body" and not message.get("more_body", False):
+                observe()
+
+        try:
+            await self.app(scope, receive, send_and_observe)
+        finally:
+            observe()
+
+
+app.add_middleware(RequestLatencyMiddleware)
+
+
 # Cache control middleware
 @app.middleware("http")
 async def set_cache_headers(request: Request, call_next):
@@ -57,40 +159,399 @@ async def set_cache_headers(request: Request, call_next):
     
     return response
 
-# Configuration from config module
-OLLAMA_BASE_URL = config.OLLAMA_BASE_URL
-DEFAULT_TEXT_MODEL = config.DEFAULT_TEXT_MODEL
-IMAGE_MODEL = config.IMAGE_MODEL
-HUGGINGFACE_TOKEN = config.HUGGINGFACE_TOKEN
-OLLAMA_TIMEOUT = config.OLLAMA_TIMEOUT
-HEALTH_CHECK_TIMEOUT = config.HEALTH_CHECK_TIMEOUT
+# Configuration from the settings instance
+DEFAULT_TEXT_MODEL = settings.default_text_model
+IMAGE_MODEL = settings.image_model
+TOP_K = settings.top_k
+HUGGINGFACE_TOKEN = settings.huggingface_token
+OLLAMA_TIMEOUT = settings.ollama_timeout
+HEALTH_CHECK_TIMEOUT = settings.health_check_timeout
+IMAGE_ANALYSIS_TIMEOUT = settings.image_analysis_timeout
+HEALTH_CACHE_TTL = settings.health_cache_ttl
+MAX_UPLOAD_SIZE = settings.max_upload_size_mb * 1024 * 1024
+TEXT_CACHE_MAX_TEMPERATURE = settings.text_cache_max_temperature
+
+# Reduced precision only applies on GPU; the CPU path stays fp32
+USE_CUDA = torch.cuda.is_available()
+MODEL_DTYPE = getattr(torch, settings.model_dtype) if USE_CUDA else torch.float32
+USE_AUTOCAST = USE_CUDA and MODEL_DTYPE != torch.float32
+
+# A statically compiled model recompiles for every new batch size, so pad batches
+PAD_TO_BATCH_SIZE = USE_CUDA and settings.torch_compile
+
+# Hugging Face Hub options: pinned revision, and no network checks when offline
+HUB_KWARGS = {
+    "token": HUGGINGFACE_TOKEN or None,
+    "revision": settings.image_model_revision,
+    "local_files_only": settings.hf_offline,
+}
 
 # Initialize image classification pipeline (lazy loading)
 image_classifier = None
 
+# All model calls run on one thread: CUDA graphs recorded by torch.compile's
+# "reduce-overhead" mode are per thread, and batches run one at a time anyway
+inference_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="modelhub-inference")
+
+# Pipeline components bound once at load time for the classify_batch hot path
+image_backend = None  # "pytorch" or "onnxruntime"
+image_processor = None
+image_resize_edge: Optional[int] = None  # Shortest edge the processor resizes to
+image_model = None
+image_labels: tuple[str, ...] = ()
+image_activation = None  # Sigmoid or softmax over the logits, chosen like the pipeline does
+
 
 def get_image_classifier():
     """Lazy load the image classification model."""
-    global image_classifier
+    global image_classifier, image_backend, image_processor, image_resize_edge, image_model
+    global image_labels, image_activation
     if image_classifier is None:
-        logger.info(f"Loading image classification model: {IMAGE_MODEL}")
-        device = 0 if torch.cuda.is_available() else -1
+        logger.info("Loading image classification model: %s", IMAGE_MODEL)
+        device = 0 if USE_CUDA else -1
         
         # Use Hugging Face token if available
-        kwargs = {"device": device}
         if HUGGINGFACE_TOKEN:
-            kwargs["use_auth_token"] = HUGGINGFACE_TOKEN
             logger.info("Using Hugging Face authentication token")
         
-        image_classifier = pipeline(
-            "image-classification",
-            model=IMAGE_MODEL,
-            **kwargs
-        )
+        classifier = None
+        if not USE_CUDA and settings.onnx_cpu:
+            try:
+                classifier = load_onnx_image_classifier()
+                backend = "onnxruntime"
+            except Exception as e:
+                logger.warning("ONNX Runtime load failed, falling back to PyTorch on CPU: %s", e)
+
+        if classifier is None:
+            classifier = pipeline(
+                "image-classification",
+                model=IMAGE_MODEL,
+                device=device,
+                torch_dtype=MODEL_DTYPE,
+                top_k=TOP_K,
+                token=HUB_KWARGS["token"],
+                revision=HUB_KWARGS["revision"],
+                model_kwargs={"local_files_only": HUB_KWARGS["local_files_only"]},
+            )
+            classifier.model.eval()
+            backend = "pytorch"
+            if USE_CUDA and settings.torch_compile:
+                # classify_batch pads every batch to BATCH_SIZE and the processor
+                # crops to a fixed size, so the model only ever sees one shape
+                classifier.model = torch.compile(
+                    classifier.model,
+                    mode="reduce-overhead",
+                    fullgraph=True,
+                    dynamic=False,
+                )
+                logger.info("Image classification model compiled with torch.compile")
+
+        # Build everything before publishing so a failure leaves the model unloaded
+        processor = classifier.image_processor
+        model_config = classifier.model.config
+        labels = tuple(model_config.id2label[i] for i in range(model_config.num_labels))
+        activation = get_activation(model_config)
+        if not labels:
+            raise ValueError(f"Image model {IMAGE_MODEL} has no labels")
+        resize_edge = get_resize_edge(processor)
+
+        image_backend = backend
+        image_processor = processor
+        image_resize_edge = resize_edge
+        image_model = classifier.model
+        image_labels = labels
+        image_activation = activation
+        image_classifier = classifier
         logger.info("Image classification model loaded successfully")
     return image_classifier
 
 
+def export_onnx_model(model_dir: Path):
+    """
+    Export IMAGE_MODEL to ONNX, optionally quantized to int8, into model_dir.
+
+    The export is written to a staging directory next to model_dir and renamed
+    into place, so concurrent workers never load a partial export.
+    """
+    from optimum.onnxruntime import ORTModelForImageClassification
+
+    model_dir.parent.mkdir(parents=True, exist_ok=True)
+    staging_dir = Path(tempfile.mkdtemp(dir=model_dir.parent, prefix=".export-"))
+    try:
+        logger.info("Exporting image classification model to ONNX: %s", model_dir)
+        model = ORTModelForImageClassification.from_pretrained(
+            IMAGE_MODEL,
+            export=True,
+            **HUB_KWARGS,
+        )
+        model.save_pretrained(staging_dir)
+
+        if settings.onnx_quantize:
+            from optimum.onnxruntime import ORTQuantizer
+            from optimum.onnxruntime.configuration import AutoQuantizationConfig
+
+            quantizer = ORTQuantizer.from_pretrained(model)
+            quantizer.quantize(
+                save_dir=staging_dir,
+                quantization_config=AutoQuantizationConfig.avx512_vnni(is_static=False, per_channel=False),
+            )
+            logger.info("Image classification model quantized to int8")
+
+        try:
+            staging_dir.rename(model_dir)
+        except OSError:
+            # Another worker finished the same export first
+            pass
+    finally:
+        shutil.rmtree(staging_dir, ignore_errors=True)
+
+
+def load_onnx_image_classifier():
+    """
+    Load the image model as an ONNX Runtime pipeline for CPU-only hosts.
+
+    The ONNX export is cached under ONNX_CACHE_DIR, keyed by model, revision
+    and quantization, so it only happens once rather than on every start.
+    Labels are taken from the Hub config so they match the PyTorch model.
+    """
+    from optimum.onnxruntime import ORTModelForImageClassification
+    from transformers import AutoConfig, AutoImageProcessor
+
+    model_key = f"{IMAGE_MODEL.replace('/', '--')}--{settings.image_model_revision}"
+    if settings.onnx_quantize:
+        model_key += "--int8"
+    model_dir = Path(settings.onnx_cache_dir) / model_key
+    file_name = "model_quantized.onnx" if settings.onnx_quantize else "model.onnx"
+
+    if not (model_dir / file_name).exists():
+        export_onnx_model(model_dir)
+    model = ORTModelForImageClassification.from_pretrained(model_dir, file_name=file_name)
+
+    hub_config = AutoConfig.from_pretrained(IMAGE_MODEL, **HUB_KWARGS)
+    model.config.id2label = hub_config.id2label
+    model.config.label2id = hub_config.label2id
+
+    return pipeline(
+        "image-classification",
+        model=model,
+        image_processor=AutoImageProcessor.from_pretrained(IMAGE_MODEL, **HUB_KWARGS),
+        top_k=TOP_K,
+    )
+
+
+def get_activation(model_config):
+    """Pick sigmoid or softmax for the logits, matching ImageClassificationPipeline."""
+    function_to_apply = getattr(model_config, "function_to_apply", None)
+    if function_to_apply == "sigmoid":
+        return torch.sigmoid
+    if function_to_apply == "softmax":
+        return lambda logits: logits.softmax(dim=-1)
+    if model_config.problem_type == "multi_label_classification" or model_config.num_labels == 1:
+        return torch.sigmoid
+    return lambda logits: logits.softmax(dim=-1)
+
+
+def get_resize_edge(processor) -> Optional[int]:
+    """Return the shortest-edge length the image processor resizes inputs to, if known."""
+    # timm-based models: resize to input_size / crop_pct, then centre-crop
+    data_config = getattr(processor, "data_config", None)
+    if data_config and "input_size" in data_config:
+        crop_pct = data_config.get("crop_pct") or 1.0
+        return math.floor(data_config["input_size"][-1] / crop_pct)
+
+    size = getattr(processor, "size", None) or {}
+    if "shortest_edge" in size:
+        return size["shortest_edge"]
+    if "height" in size and "width" in size:
+        return max(size["height"], size["width"])
+    return None
+
+
+def warm_up_image_classifier():
+    """Load the image model and run one dummy forward pass to warm up kernels."""
+    get_image_classifier()
+    edge = image_resize_edge or 224
+    classify_batch([Image.new("RGB", (edge, edge))])
+    logger.info("Image classification model warmed up")
+
+
+def load_image(fp: BinaryIO) -> Image.Image:
+    """
+    Decode an uploaded image file into an RGB PIL image.
+
+    Once the model is loaded, large images are shrunk so their shorter side
+    matches the image processor's resize target, keeping the aspect ratio;
+    the processor still does its own resize and centre crop.
+    """
+    edge = image_resize_edge
+    image = Image.open(fp)
+    if edge:
+        # For JPEGs, let libjpeg decode at a reduced DCT scale no smaller than the target
+        image.draft("RGB", (edge, edge))
+    image.load()
+
+    # Convert to RGB if needed
+    if image.mode != "RGB":
+        image = image.convert("RGB")
+
+    if edge and min(image.size) > edge:
+        scale = edge / min(image.size)
+        new_size = (max(edge, round(image.width * scale)), max(edge, round(image.height * scale)))
+        image = image.resize(new_size, Image.BICUBIC)
+    return image
+
+
+def classify_batch(images: list) -> list:
+    """
+    Run the image classifier over a batch of PIL images.
+
+    Calls the image processor and model bound at load time directly, skipping
+    the pipeline's per-call machinery, so the batch can be built as a
+    channels_last tensor and copied to the GPU from pinned memory. Returns one
+    list of label/score predictions per image, in the same shape the pipeline
+    would.
+    """
+    if image_classifier is None:
+        get_image_classifier()
+    labels = image_labels
+
+    pixel_values = image_processor(images, return_tensors="pt")["pixel_values"]
+    batch_len = pixel_values.shape[0]
+    if PAD_TO_BATCH_SIZE and batch_len < settings.batch_size:
+        padding = pixel_values.new_zeros((settings.batch_size - batch_len, *pixel_values.shape[1:]))
+        pixel_values = torch.cat([pixel_values, padding])
+    if image_backend == "pytorch":
+        pixel_values = pixel_values.to(memory_format=torch.channels_last)
+    if USE_CUDA:
+        pixel_values = pixel_values.pin_memory().to(
+            "cuda", dtype=MODEL_DTYPE, non_blocking=True
+        )
+
+    with torch.inference_mode(), torch.autocast("cuda", dtype=MODEL_DTYPE, enabled=USE_AUTOCAST):
+        logits = image_model(pixel_values).logits[:batch_len]
+
+    probs = image_activation(logits.float())
+    top_k = min(TOP_K, len(labels))
+    scores, indices = probs.topk(top_k, dim=-1)
+
+    return [
+        [
+            {"label": labels[index], "score": score}
+            for score, index in zip(row_scores, row_indices)
+        ]
+        for row_scores, row_indices in zip(scores.tolist(), indices.tolist())
+    ]
+
+
+def hash_upload(fp: BinaryIO) -> str:
+    """Hash an uploaded file's content with xxh3 and rewind it for decoding."""
+    hasher = xxhash.xxh3_64()
+    file_size = fp.seek(0, io.SEEK_END)
+    fp.seek(0)
+    # One buffer sized to the upload (capped at 1 MiB), refilled via readinto and
+    # hashed through a memoryview so no bytes object is created per chunk
+    buffer = bytearray(max(1, min(file_size, 1024 * 1024)))
+    view = memoryview(buffer)
+    while size := fp.readinto(buffer):
+        hasher.update(view[:size])
+    fp.seek(0)
+    return hasher.hexdigest()
+
+
+# Predictions keyed by image content hash, plus in-flight work for deduplication
+image_prediction_cache = TTLCache(maxsize=settings.image_cache_size, ttl=settings.image_cache_ttl)
+image_inflight: dict[str, asyncio.Task] = {}
+CACHE_SIZE.labels("image").set_function(lambda: len(image_prediction_cache))
+
+
+async def classify_image(image: Image.Image, key: str) -> list:
+    """Classify a decoded image via the batcher and cache the result."""
+    future = asyncio.get_running_loop().create_future()
+    await app.state.image_queue.put((image, future))
+    predictions = await future
+
+    image_prediction_cache[key] = predictions
+    return predictions
+
+
+async def classify_upload(fp: BinaryIO) -> list:
+    """
+    Classify an uploaded image, reusing results for identical content.
+
+    Cached predictions are returned directly; concurrent uploads of the same
+    image share a single forward pass. Each caller decodes its own upload
+    before joining, so the shared task never reads another request's file.
+    """
+    key = await asyncio.to_thread(hash_upload, fp)
+
+    predictions = image_prediction_cache.get(key)
+    if predictions is not None:
+        CACHE_HITS.labels("image").inc()
+        return predictions
+
+    task = image_inflight.get(key)
+    if task is None:
+        image = await asyncio.to_thread(load_image, fp)
+
+        # Another upload of the same image may have finished or started while decoding
+        predictions = image_prediction_cache.get(key)
+        if predictions is not None:
+            CACHE_HITS.labels("image").inc()
+            return predictions
+        task = image_inflight.get(key)
+        if task is None:
+            CACHE_MISSES.labels("image").inc()
+            task = asyncio.create_task(classify_image(image, key))
+            image_inflight[key] = task
+            task.add_done_callback(lambda _: image_inflight.pop(key, None))
+
+    # Shield so one caller timing out does not cancel the work for the others
+    return await asyncio.shield(task)
+
+
+async def run_image_batcher(queue: asyncio.Queue):
+    """
+    Coalesce concurrent image requests into batched classifier calls.
+
+    Waits for the first queued request, then keeps collecting until either
+    BATCH_SIZE images are gathered or MAX_BATCH_DELAY_MS has elapsed.
+    """
+    loop = asyncio.get_running_loop()
+    max_delay = settings.max_batch_delay_ms / 1000
+    batch_size = settings.batch_size
+
+    while True:
+        batch = [await queue.get()]
+        deadline = loop.time() + max_delay
+        while len(batch) < batch_size:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(queue.get(), timeout=remaining))
+            except asyncio.TimeoutError:
+                break
+
+        # Skip requests whose callers already gave up
+        batch = [(image, future) for image, future in batch if not future.done()]
+        if not batch:
+            continue
+
+        try:
+            results = await loop.run_in_executor(
+                inference_executor, classify_batch, [image for image, _ in batch]
+            )
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            continue
+
+        for (_, future), predictions in zip(batch, results):
+            if not future.done():
+                future.set_result(predictions)
+
+
 # Request/Response models
 class TextGenerationRequest(BaseModel):
     """Request model for text generation."""
@@ -126,6 +587,29 @@ class HealthResponse(BaseModel):
     image_model_loaded: bool
 
 
+# Last Ollama probe result, reused for HEALTH_CACHE_TTL seconds
+_ollama_status_cache = {"ts": 0.0, "ok": False}
+
+
+async def check_ollama_available() -> bool:
+    """Probe Ollama's root endpoint, caching the result briefly."""
+    now = time.monotonic()
+    if now - _ollama_status_cache["ts"] < HEALTH_CACHE_TTL:
+        return _ollama_status_cache["ok"]
+
+    ollama_available = False
+    try:
+        # "/" answers "Ollama is running" without enumerating models like /api/tags
+        response = await app.state.http.get("/", timeout=HEALTH_CHECK_TIMEOUT)
+        ollama_available = response.status_code == 200
+    except Exception as e:
+        logger.warning("Ollama health check failed: %s", e)
+
+    _ollama_status_cache["ts"] = time.monotonic()
+    _ollama_status_cache["ok"] = ollama_available
+    return ollama_available
+
+
 # API Endpoints
 @app.get("/", response_model=dict)
 async def root():
@@ -137,6 +621,7 @@ async def root():
             "dashboard": "/dashboard",
             "health": "/health",
             "meta": "/meta.json",
+            "metrics": "/metrics",
             "text_generation": "/api/v1/generate/text",
             "image_analysis": "/api/v1/analyze/image",
         },
@@ -149,6 +634,12 @@ async def meta():
     return {"bootId": SERVER_BOOT_ID}
 
 
+@app.get("/metrics")
+async def metrics():
+    """Prometheus metrics: request latency and cache statistics."""
+    return Response(content=generate_latest(), media_type=CONTENT_TYPE_LATEST)
+
+
 @app.get("/dashboard", response_class=HTMLResponse)
 async def dashboard(request: Request):
     """Dashboard web UI."""
@@ -158,17 +649,9 @@ async def dashboard(request: Request):
 @app.get("/health", response_model=HealthResponse)
 async def health_check():
     """Health check endpoint."""
-    ollama_available = False
+    ollama_available = await check_ollama_available()
     image_model_loaded = image_classifier is not None
 
-    # Check Ollama availability
-    try:
-        async with httpx.AsyncClient(timeout=HEALTH_CHECK_TIMEOUT) as client:
-            response = await client.get(f"{OLLAMA_BASE_URL}/api/tags")
-            ollama_available = response.status_code == 200
-    except Exception as e:
-        logger.warning(f"Ollama health check failed: {e}")
-
     return HealthResponse(
         status="healthy" if ollama_available else "degraded",
         ollama_available=ollama_available,
@@ -176,35 +659,57 @@ async def health_check():
     )
 
 
+async def fetch_ollama_version() -> Optional[str]:
+    """Return the Ollama server version, or None if it cannot be fetched."""
+    try:
+        response = await app.state.http.get("/api/version", timeout=HEALTH_CHECK_TIMEOUT)
+        if response.status_code == 200:
+            return orjson.loads(response.content).get("version")
+    except Exception as e:
+        logger.warning("Failed to fetch Ollama version: %s", e)
+    return None
+
+
 @app.get("/api/v1/models", response_model=dict)
 async def list_models():
     """
     List available Ollama models.
 
     Returns:
-        Dictionary with list of available models
+        Dictionary with list of available models and the Ollama version
     """
+    http = app.state.http
     try:
-        async with httpx.AsyncClient(timeout=HEALTH_CHECK_TIMEOUT) as client:
-            response = await client.get(f"{OLLAMA_BASE_URL}/api/tags")
-            
-            if response.status_code != 200:
-                raise HTTPException(
-                    status_code=response.status_code,
-                    detail="Failed to fetch models from Ollama",
-                )
-            
-            data = response.json()
-            models = data.get("models", [])
-            
-            # Extract model names
-            model_names = [model.get("name", "") for model in models if model.get("name")]
-            
-            return {
-                "models": model_names,
-                "default_model": DEFAULT_TEXT_MODEL,
-            }
-            
+        # Fetch the model list and server version over the pool concurrently
+        try:
+            async with asyncio.TaskGroup() as tg:
+                tags_task = tg.create_task(http.get("/api/tags", timeout=HEALTH_CHECK_TIMEOUT))
+                version_task = tg.create_task(fetch_ollama_version())
+        except ExceptionGroup as eg:
+            raise eg.exceptions[0]
+
+        response = tags_task.result()
+
+        if response.status_code != 200:
+            raise HTTPException(
+                status_code=response.status_code,
+                detail="Failed to fetch models from Ollama",
+            )
+
+        data = orjson.loads(response.content)
+        models = data.get("models", [])
+
+        # Extract model names
+        model_names = [model.get("name", "") for model in models if model.get("name")]
+
+        return {
+            "models": model_names,
+            "default_model": DEFAULT_TEXT_MODEL,
+            "ollama_version": version_task.result(),
+        }
+
+    except HTTPException:
+        raise
     except httpx.TimeoutException:
         raise HTTPException(
             status_code=504,
@@ -216,55 +721,161 @@ async def list_models():
             detail=f"Failed to connect to Ollama: {str(e)}",
         )
     except Exception as e:
-        logger.error(f"Error listing models: {e}")
+        logger.error("Error listing models: %s", e)
         raise HTTPException(
             status_code=500,
             detail=f"Internal server error: {str(e)}",
         )
 
 
+async def stream_ollama_response(response: httpx.Response, model: str):
+    """
+    Relay Ollama's newline-delimited JSON stream as server-sent events.
+
+    Each event carries a {"text": ...} chunk; the final event is
+    {"done": true, "model": ...}, or {"error": ...} if the stream breaks.
+    """
+    try:
+        async for line in response.aiter_lines():
+            if not line:
+                continue
+            chunk = orjson.loads(line)
+            if "error" in chunk:
+                yield b"data: " + orjson.dumps({"error": chunk["error"]}) + b"\n\n"
+                return
+            token = chunk.get("response", "")
+            if token:
+                yield b"data: " + orjson.dumps({"text": token}) + b"\n\n"
+            if chunk.get("done"):
+                break
+        yield b"data: " + orjson.dumps({"done": True, "model": model}) + b"\n\n"
+    except Exception as e:
+        logger.error("Text generation stream error: %s", e)
+        yield b"data: " + orjson.dumps({"error": str(e)}) + b"\n\n"
+    finally:
+        await response.aclose()
+
+
+# Completions keyed by hash of (model, max_tokens, temperature, prompt),
+# plus in-flight generations for deduplication
+text_completion_cache = TTLCache(maxsize=settings.text_cache_size, ttl=settings.text_cache_ttl)
+text_inflight: dict[str, asyncio.Task] = {}
+CACHE_SIZE.labels("text").set_function(lambda: len(text_completion_cache))
+
+
+async def fetch_completion(payload: dict) -> str:
+    """Run a non-streaming Ollama generation and return the generated text."""
+    response = await app.state.http.post(
+        "/api/generate",
+        json=payload,
+        timeout=OLLAMA_TIMEOUT,
+    )
+
+    if response.status_code != 200:
+        raise HTTPException(
+            status_code=response.status_code,
+            detail=f"Ollama API error: {response.text}",
+        )
+
+    result = orjson.loads(response.content)
+    return result.get("response", "")
+
+
+async def fetch_cached_completion(payload: dict, key: str) -> str:
+    """Run an Ollama generation and cache the result under key."""
+    generated_text = await fetch_completion(payload)
+    text_completion_cache[key] = generated_text
+    return generated_text
+
+
 @app.post("/api/v1/generate/text", response_model=TextGenerationResponse)
-async def generate_text(request: TextGenerationRequest):
+async def generate_text(
+    request: TextGenerationRequest,
+    x_cache_ok: Optional[str] = Header(default=None),
+):
     """
     Generate text using Ollama LLM.
 
+    Non-streaming completions are cached when the temperature is near zero,
+    or for any temperature when the client sends an X-Cache-Ok header.
+
     Args:
         request: TextGenerationRequest with prompt and generation parameters
+        x_cache_ok: Opt in to cached completions regardless of temperature
 
     Returns:
-        TextGenerationResponse with generated text
+        TextGenerationResponse with generated text, or a text/event-stream
+        of token chunks when request.stream is set
     """
+    http = app.state.http
     try:
-        async with httpx.AsyncClient(timeout=OLLAMA_TIMEOUT) as client:
-            payload = {
-                "model": request.model,
-                "prompt": request.prompt,
-                "stream": False,
-                "options": {
-                    "num_predict": request.max_tokens,
-                    "temperature": request.temperature,
-                },
-            }
-
-            response = await client.post(
-                f"{OLLAMA_BASE_URL}/api/generate",
+        payload = {
+            "model": request.model,
+            "prompt": request.prompt,
+            "stream": bool(request.stream),
+            "options": {
+                "num_predict": request.max_tokens,
+                "temperature": request.temperature,
+            },
+        }
+
+        if request.stream:
+            ollama_request = http.build_request(
+                "POST",
+                "/api/generate",
                 json=payload,
+                timeout=OLLAMA_TIMEOUT,
             )
+            response = await http.send(ollama_request, stream=True)
 
             if response.status_code != 200:
+                await response.aread()
+                await response.aclose()
                 raise HTTPException(
                     status_code=response.status_code,
                     detail=f"Ollama API error: {response.text}",
                 )
 
-            result = response.json()
-            generated_text = result.get("response", "")
+            # Close the upstream response even if the client disconnects before streaming starts
+            return StreamingResponse(
+                stream_ollama_response(response, request.model),
+                media_type="text/event-stream",
+                background=BackgroundTask(response.aclose),
+            )
 
-            return TextGenerationResponse(
-                text=generated_text,
-                model=request.model,
+        cacheable = (
+            request.temperature is not None
+            and request.temperature <= TEXT_CACHE_MAX_TEMPERATURE
+        ) or (x_cache_ok is not None and x_cache_ok.lower() in ("1", "true", "yes"))
+        if cacheable:
+            key = xxhash.xxh3_64_hexdigest(
+                f"{request.model}|{request.max_tokens}|{request.temperature}|{request.prompt}".encode()
             )
+            generated_text = text_completion_cache.get(key)
+            if generated_text is not None:
+                CACHE_HITS.labels("text").inc()
+                return TextGenerationResponse(text=generated_text, model=request.model)
+
+            # Identical concurrent prompts share one Ollama generation
+            task = text_inflight.get(key)
+            if task is None:
+                CACHE_MISSES.labels("text").inc()
+                task = asyncio.create_task(fetch_cached_completion(payload, key))
+                text_inflight[key] = task
+                task.add_done_callback(lambda _: text_inflight.pop(key, None))
+
+            # Shield so one caller disconnecting does not cancel the work for the others
+            generated_text = await asyncio.shield(task)
+        else:
+            generated_text = await fetch_completion(payload)
+
+        return TextGenerationResponse(
+            text=generated_text,
+            model=request.model,
+        )
 
+    except HTTPException:
+        raise
     except httpx.TimeoutException:
         raise HTTPException(
             status_code=504,
@@ -276,7 +887,7 @@ async def generate_text(request: TextGenerationRequest):
             detail=f"Failed to connect to Ollama: {str(e)}",
         )
     except Exception as e:
-        logger.error(f"Text generation error: {e}")
+        logger.error("Text generation error: %s", e)
         raise HTTPException(
             status_code=500,
             detail=f"Internal server error: {str(e)}",
@@ -300,26 +911,30 @@ async def analyze_image(file: UploadFile = File(...)):
             detail="File must be an image",
         )
 
-    try:
-        # Read and process image
-        contents = await file.read()
-        image = Image.open(io.BytesIO(contents))
-
-        # Convert to RGB if needed
-        if image.mode != "RGB":
-            image = image.convert("RGB")
+    if file.size is not None and file.size > MAX_UPLOAD_SIZE:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Image exceeds maximum upload size of {settings.max_upload_size_mb} MB",
+        )
 
-        # Get classifier and make predictions
-        classifier = get_image_classifier()
-        predictions = classifier(image)
+    try:
+        # Decode straight from the spooled upload file and classify via the batcher
+        predictions = await asyncio.wait_for(
+            classify_upload(file.file), timeout=IMAGE_ANALYSIS_TIMEOUT
+        )
 
         return ImageAnalysisResponse(
             predictions=predictions,
             model=IMAGE_MODEL,
         )
 
+    except asyncio.TimeoutError:
+        raise HTTPException(
+            status_code=504,
+            detail="Image analysis timed out",
+        )
     except Exception as e:
-        logger.error(f"Image analysis error: {e}")
+        logger.error("Image analysis error: %s", e)
         
         # Provide specific error messages for common Hugging Face authentication issues
         error_msg = str(e)
@@ -341,4 +956,12 @@ async def analyze_image(file: UploadFile = File(...)):
 if __name__ == "__main__":
     import uvicorn
 
-    uvicorn.run(app, host=config.API_HOST, port=config.API_PORT)
+    # A single worker serves this module's app directly rather than importing app.py a second time
+    uvicorn.run(
+        app if settings.web_concurrency == 1 else "app:app",
+        host=settings.api_host,
+        port=settings.api_port,
+        loop="uvloop",
+        http="httptools",
+        workers=settings.web_concurrency,
+    )
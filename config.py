@@ -4,32 +4,15 @@ Can be overridden using environment variables.
 """
 
 import os
+from dataclasses import dataclass
 from pathlib import Path
 
-# Ollama Configuration
-OLLAMA_BASE_URL = os.getenv("OLLAMA_BASE_URL", "http://ollama:11434")
-DEFAULT_TEXT_MODEL = os.getenv("DEFAULT_TEXT_MODEL", "deepseek-r1:8b")
-
-# Hugging Face Configuration
-IMAGE_MODEL = os.getenv("IMAGE_MODEL", "marqo/nsfw-image-detection-384")
-
-# API Configuration
-API_HOST = os.getenv("API_HOST", "0.0.0.0")
-API_PORT = int(os.getenv("API_PORT", "8000"))
-
-# Model Loading Configuration
-LAZY_LOAD_IMAGE_MODEL = os.getenv("LAZY_LOAD_IMAGE_MODEL", "true").lower() == "true"
-
-# Timeout Configuration (seconds)
-OLLAMA_TIMEOUT = int(os.getenv("OLLAMA_TIMEOUT", "600"))  # Increased for larger models
-HEALTH_CHECK_TIMEOUT = int(os.getenv("HEALTH_CHECK_TIMEOUT", "5"))
-
 
 def load_api_keys():
     """Load API keys from api_keys.txt file."""
     api_keys = {}
     api_keys_file = Path(__file__).parent / "api_keys.txt"
-    
+
     if api_keys_file.exists():
         try:
             with open(api_keys_file, 'r') as f:
@@ -41,12 +24,99 @@ def load_api_keys():
                             api_keys[key.strip()] = value.strip()
         except Exception as e:
             print(f"Warning: Failed to load API keys from {api_keys_file}: {e}")
-    
+
     return api_keys
 
 
+@dataclass(frozen=True, slots=True)
+class Settings:
+    """Service settings, resolved once from the environment at import time."""
+
+    # Ollama Configuration
+    ollama_base_url: str
+    default_text_model: str
+
+    # Hugging Face Configuration
+    image_model: str
+    top_k: int  # Number of image predictions returned
+    huggingface_token: str
+    image_model_revision: str  # Hub revision (branch, tag or commit) to load
+    hf_offline: bool  # Load only from the local cache, skipping Hub network checks
+
+    # API Configuration
+    api_host: str
+    api_port: int
+    web_concurrency: int  # Number of uvicorn worker processes
+
+    # Upload Limits
+    max_upload_size_mb: int
+
+    # Model Loading Configuration
+    lazy_load_image_model: bool
+    model_dtype: str  # float16, bfloat16 or float32; GPU only
+    torch_compile: bool  # GPU only
+    onnx_cpu: bool  # Serve the image model with ONNX Runtime when CUDA is absent
+    onnx_quantize: bool  # Dynamically quantize the ONNX model to int8
+    onnx_cache_dir: str  # Where ONNX exports are kept between restarts
+
+    # Image Batching Configuration
+    batch_size: int
+    max_batch_delay_ms: int
+    thread_pool_size: int
+
+    # Image Prediction Cache Configuration
+    image_cache_size: int
+    image_cache_ttl: int  # seconds
+
+    # Text Completion Cache Configuration
+    text_cache_size: int
+    text_cache_ttl: int  # seconds
+    text_cache_max_temperature: float  # Deterministic only
+
+    # Timeout Configuration (seconds)
+    ollama_timeout: int
+    health_check_timeout: int
+    health_cache_ttl: float  # Reuse last Ollama probe result
+    image_analysis_timeout: int
+
+    # Ollama Connection Pool Configuration
+    http_max_connections: int
+    http_max_keepalive_connections: int
+
+
 # Load API keys
 _api_keys = load_api_keys()
 
-# Hugging Face Configuration  
-HUGGINGFACE_TOKEN = os.getenv("HUGGINGFACE_TOKEN", _api_keys.get("huggingface", ""))
+settings = Settings(
+    ollama_base_url=os.getenv("OLLAMA_BASE_URL", "http://ollama:11434"),
+    default_text_model=os.getenv("DEFAULT_TEXT_MODEL", "deepseek-r1:8b"),
+    image_model=os.getenv("IMAGE_MODEL", "marqo/nsfw-image-detection-384"),
+    top_k=int(os.getenv("TOP_K", "5")),
+    huggingface_token=os.getenv("HUGGINGFACE_TOKEN", _api_keys.get("huggingface", "")),
+    image_model_revision=os.getenv("IMAGE_MODEL_REVISION", "main"),
+    hf_offline=os.getenv("HF_OFFLINE", "false").lower() == "true",
+    api_host=os.getenv("API_HOST", "0.0.0.0"),
+    api_port=int(os.getenv("API_PORT", "8000")),
+    web_concurrency=int(os.getenv("WEB_CONCURRENCY", "1")),
+    max_upload_size_mb=int(os.getenv("MAX_UPLOAD_SIZE_MB", "20")),
+    lazy_load_image_model=os.getenv("LAZY_LOAD_IMAGE_MODEL", "true").lower() == "true",
+    model_dtype=os.getenv("MODEL_DTYPE", "float16"),
+    torch_compile=os.getenv("TORCH_COMPILE", "false").lower() == "true",
+    onnx_cpu=os.getenv("ONNX_CPU", "false").lower() == "true",
+    onnx_quantize=os.getenv("ONNX_QUANTIZE", "false").lower() == "true",
+    onnx_cache_dir=os.getenv("ONNX_CACHE_DIR", str(Path.home() / ".cache" / "modelhub" / "onnx")),
+    batch_size=int(os.getenv("BATCH_SIZE", "8")),
+    max_batch_delay_ms=int(os.getenv("MAX_BATCH_DELAY_MS", "20")),
+    thread_pool_size=int(os.getenv("THREAD_POOL_SIZE", "64")),
+    image_cache_size=int(os.getenv("IMAGE_CACHE_SIZE", "10000")),
+    image_cache_ttl=int(os.getenv("IMAGE_CACHE_TTL", "3600")),
+    text_cache_size=int(os.getenv("TEXT_CACHE_SIZE", "1000")),
+    text_cache_ttl=int(os.getenv("TEXT_CACHE_TTL", "600")),
+    text_cache_max_temperature=float(os.getenv("TEXT_CACHE_MAX_TEMPERATURE", "0.01")),
+    ollama_timeout=int(os.getenv("OLLAMA_TIMEOUT", "600")),  # Increased for larger models
+    health_check_timeout=int(os.getenv("HEALTH_CHECK_TIMEOUT", "5")),
+    health_cache_ttl=float(os.getenv("HEALTH_CACHE_TTL", "2")),
+    image_analysis_timeout=int(os.getenv("IMAGE_ANALYSIS_TIMEOUT", "120")),  # Covers first-request model load
+    http_max_connections=int(os.getenv("HTTP_MAX_CONNECTIONS", "100")),
+    http_max_keepalive_connections=int(os.getenv("HTTP_MAX_KEEPALIVE_CONNECTIONS", "20")),
+)
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Offline checks for the image micro-batcher, with the classifier stubbed out.
+
+Unlike the other example scripts this does not need a running service, but it
+imports app.py, so the service's Python dependencies must be installed.
+"""
+
+import asyncio
+import io
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import app as service  # noqa: E402
+
+
+async def submit(queue, images):
+    """Queue images for the batcher and return their futures."""
+    loop = asyncio.get_running_loop()
+    futures = []
+    for image in images:
+        future = loop.create_future()
+        await queue.put((image, future))
+        futures.append(future)
+    return futures
+
+
+async def run_with_batcher(stub, scenario):
+    """Run a scenario against a batcher whose classify_batch is replaced by stub."""
+    original = service.classify_batch
+    service.classify_batch = stub
+    queue = asyncio.Queue()
+    service.app.state.image_queue = queue
+    batcher = asyncio.create_task(service.run_image_batcher(queue))
+    try:
+        return await scenario(queue)
+    finally:
+        batcher.cancel()
+        try:
+            await batcher
+        except asyncio.CancelledError:
+            pass
+        service.classify_batch = original
+
+
+def test_batching_within_delay():
+    """Images queued within MAX_BATCH_DELAY_MS are classified in one call."""
+    batches = []
+
+    def stub(images):
+        batches.append(list(images))
+        return [[{"label": image, "score": 1.0}] for image in images]
+
+    async def scenario(queue):
+        futures = await submit(queue, ["a", "b", "c"])
+        return await asyncio.gather(*futures)
+
+    results = asyncio.run(run_with_batcher(stub, scenario))
+
+    assert batches == [["a", "b", "c"]], f"expected one batch of 3, got {batches}"
+    assert [r[0]["label"] for r in results] == ["a", "b", "c"], results
+    print("   ✓ Concurrent images were coalesced into one batch")
+
+
+def test_error_fan_out():
+    """A classifier error is delivered to every future in the batch."""
+
+    def stub(images):
+        raise RuntimeError("boom")
+
+    async def scenario(queue):
+        futures = await submit(queue, ["a", "b", "c"])
+        return await asyncio.gather(*futures, return_exceptions=True)
+
+    results = asyncio.run(run_with_batcher(stub, scenario))
+
+    assert len(results) == 3, results
+    assert all(isinstance(r, RuntimeError) and str(r) == "boom" for r in results), results
+    print("   ✓ Classifier errors reached every request in the batch")
+
+
+def test_concurrent_identical_uploads_share_task():
+    """Concurrent uploads of the same bytes share one classification."""
+    batches = []
+
+    def stub(images):
+        batches.append(list(images))
+        return [[{"label": "safe", "score": 1.0}] for _ in images]
+
+    async def scenario(queue):
+        uploads = [io.BytesIO(b"identical image bytes") for _ in range(5)]
+        return await asyncio.gather(*(service.classify_upload(fp) for fp in uploads))
+
+    original_load_image = service.load_image
+    service.load_image = lambda fp: fp.read()
+    service.image_prediction_cache.clear()
+    try:
+        results = asyncio.run(run_with_batcher(stub, scenario))
+    finally:
+        service.load_image = original_load_image
+        service.image_prediction_cache.clear()
+
+    assert sum(len(batch) for batch in batches) == 1, f"expected one image classified, got {batches}"
+    assert all(r == [{"label": "safe", "score": 1.0}] for r in results), results
+    assert not service.image_inflight, service.image_inflight
+    print("   ✓ Identical concurrent uploads shared one classification")
+
+
+if __name__ == "__main__":
+    print("Testing image micro-batcher...")
+    print()
+    test_batching_within_delay()
+    test_error_fan_out()
+    test_concurrent_identical_uploads_share_task()
+    print()
+    print("✓ All batcher checks passed!")
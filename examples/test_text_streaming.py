@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Example script to test streaming text generation (server-sent events).
+"""
+
+import json
+import requests
+import sys
+
+
+def test_text_streaming():
+    """Test the text generation endpoint with streaming enabled."""
+    url = "http://localhost:8000/api/v1/generate/text"
+
+    # Test prompt
+    payload = {
+        "prompt": "Write a haiku about artificial intelligence",
+        "model": "deepseek-r1:8b",
+        "max_tokens": 100,
+        "temperature": 0.8,
+        "stream": True,
+    }
+
+    print("Testing streaming text generation endpoint...")
+    print(f"Prompt: {payload['prompt']}")
+    print()
+
+    try:
+        with requests.post(url, json=payload, stream=True, timeout=60) as response:
+            response.raise_for_status()
+
+            content_type = response.headers.get("Content-Type", "")
+            if not content_type.startswith("text/event-stream"):
+                print(f"✗ Unexpected Content-Type: {content_type}")
+                sys.exit(1)
+
+            print("Generated text:")
+            print("-" * 50)
+            chunks = 0
+            done = None
+            for line in response.iter_lines(decode_unicode=True):
+                if not line or not line.startswith("data: "):
+                    continue
+                event = json.loads(line[len("data: "):])
+                if "error" in event:
+                    print()
+                    print(f"✗ Stream error: {event['error']}")
+                    sys.exit(1)
+                if "text" in event:
+                    chunks += 1
+                    print(event["text"], end="", flush=True)
+                if event.get("done"):
+                    done = event
+            print()
+            print("-" * 50)
+
+        if done is None:
+            print("✗ Stream ended without a done event")
+            sys.exit(1)
+
+        print(f"Chunks received: {chunks}")
+        print(f"Model used: {done['model']}")
+        print()
+        print("✓ Test passed!")
+
+    except requests.exceptions.RequestException as e:
+        print(f"✗ Error: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    test_text_streaming()
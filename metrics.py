@@ -0,0 +1,14 @@
+"""
+Prometheus metrics for the ModelHub service.
+Kept out of app.py so every import of the app shares one registration,
+including `python app.py`, where app.py is loaded both as __main__ and as app.
+"""
+
+from prometheus_client import Counter, Gauge, Histogram
+
+REQUEST_LATENCY = Histogram(
+    "http_request_latency_seconds", "HTTP request latency in seconds", ["endpoint"]
+)
+CACHE_HITS = Counter("cache_hits_total", "Cache hits", ["cache"])
+CACHE_MISSES = Counter("cache_misses_total", "Cache misses", ["cache"])
+CACHE_SIZE = Gauge("cache_size", "Number of entries in the cache", ["cache"])